@@ -0,0 +1,154 @@
+DISK = 'disk'
+MEMORY = 'memory'
+NONE = 'none'
+
+DECISIONS = (DISK, MEMORY, NONE)
+
+
+class AdmissionPolicy(object):
+    '''
+    Decides what a `Cachable` function should do with a freshly computed result.
+    The decision is one of `DISK` (persist using the loader), `MEMORY` (keep the
+    result in memory only, for the lifetime of the decorated function), or
+    `NONE` (do not cache the result at all).
+    '''
+
+    # Whether `admit` uses the size of the result. If not, results are only
+    # serialized when they are persisted.
+    needs_size = True
+
+    def admit(self, compute_time, size):
+        '''
+        Parameters
+        ----------
+        compute_time : float
+            Number of seconds the function took to compute the result.
+        size : int | None
+            Size in bytes of the serialized result, or None if it was not
+            measured, or the result could not be serialized.
+
+        Returns
+        -------
+        str
+            One of `DISK`, `MEMORY` or `NONE`.
+        '''
+        raise NotImplementedError()
+
+
+class FixedAdmission(AdmissionPolicy):
+    '''Policy that always makes the same decision.'''
+
+    def __init__(self, decision=DISK):
+        if decision not in DECISIONS:
+            raise ValueError(
+                'Unknown admission decision {!r}; expected one of {}.'
+                .format(decision, DECISIONS))
+
+        self.decision = decision
+
+        # Persisted results are serialized anyway, so the size comes for free.
+        self.needs_size = decision == DISK
+
+    def admit(self, compute_time, size):
+        return self.decision
+
+
+class CostAwareAdmission(AdmissionPolicy):
+    '''
+    Policy that only persists results that are worth a disk round-trip. Results
+    that were computed faster than `min_compute_time`, or whose serialized size
+    exceeds `max_bytes_per_second` bytes per second of compute, are kept in
+    memory instead; if they are also larger than `max_memory_size`, they are not
+    cached at all.
+    '''
+
+    def __init__(
+            self,
+            min_compute_time=0.01,
+            max_bytes_per_second=None,
+            max_memory_size=None):
+        '''
+        Parameters
+        ----------
+        min_compute_time : float, optional
+            Results that took fewer seconds than this to compute are not
+            persisted to disk. 10ms by default.
+        max_bytes_per_second : float, optional
+            Results whose serialized size is more than this many bytes per
+            second of compute are not persisted to disk. If None, the size is
+            not taken into account.
+        max_memory_size : int, optional
+            Results that are not persisted are only kept in memory if their
+            serialized size is at most this many bytes. If None, there is no
+            limit.
+        '''
+        self.min_compute_time = min_compute_time
+        self.max_bytes_per_second = max_bytes_per_second
+        self.max_memory_size = max_memory_size
+
+        # The size is only used for the size limits.
+        self.needs_size = (
+            max_bytes_per_second is not None or max_memory_size is not None)
+
+    def admit(self, compute_time, size):
+        cheap = compute_time < self.min_compute_time
+
+        too_large = (
+            self.max_bytes_per_second is not None and
+            size is not None and
+            size > self.max_bytes_per_second * compute_time)
+
+        if not cheap and not too_large:
+            return DISK
+
+        if (self.max_memory_size is not None and
+                size is not None and
+                size > self.max_memory_size):
+            return NONE
+
+        return MEMORY
+
+
+def get_policy(admission):
+    '''
+    Returns an `AdmissionPolicy` for `admission`, which may be a policy, a
+    decision string, or None (in which case every result is persisted to disk).
+    '''
+    if admission is None:
+        return FixedAdmission(DISK)
+
+    if isinstance(admission, str):
+        return FixedAdmission(admission)
+
+    return admission
+
+
+class CacheStats(object):
+    '''
+    Statistics collected by a `Cachable` function, available on the decorated
+    function as `stats`.
+    '''
+
+    def __init__(self):
+        self.disk_hits = 0
+        self.memory_hits = 0
+        self.misses = 0
+        self.decisions = {decision: 0 for decision in DECISIONS}
+
+        self.last_decision = None
+        self.last_compute_time = None
+        self.last_size = None
+
+    def record_miss(self, decision, compute_time, size):
+        self.misses += 1
+        self.decisions[decision] += 1
+
+        self.last_decision = decision
+        self.last_compute_time = compute_time
+        self.last_size = size
+
+    def __repr__(self):
+        return (
+            'CacheStats(disk_hits={}, memory_hits={}, misses={}, '
+            'decisions={})'.format(
+                self.disk_hits, self.memory_hits, self.misses, self.decisions))
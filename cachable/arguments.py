@@ -0,0 +1,197 @@
+from inspect import Parameter, signature
+from itertools import compress
+
+
+# Types whose values are memoized by `ArgBinder.key`. These are immutable, and
+# equal values of the same type have the same string representation, so they
+# are guaranteed to map to the same file name. This is not the case for floats
+# (`0.0 == -0.0`), so they are keyed by their string representation instead,
+# except for NaNs, which are never memoized since they are only equal to a NaN
+# default if they are the same object.
+_MEMO_TYPES = frozenset([str, bytes, int, bool, type(None)])
+
+
+def _memo_key(value):
+    value_type = type(value)
+
+    if value_type in _MEMO_TYPES:
+        return (value_type, value)
+
+    if value_type is float and value == value:
+        return (value_type, str(value))
+
+    if value_type is tuple:
+        return (value_type, tuple(_memo_key(v) for v in value))
+
+    raise TypeError()
+
+
+def _is_hidden(name):
+    return name.startswith('_') or name == 'self'
+
+
+def is_default(value, default):
+    '''
+    Checks whether `value` is equal to the default value, `default`. Values that
+    compare element-wise (e.g., NumPy arrays) are only equal to the default if
+    they have the same shape and all of their elements are equal. Values that
+    cannot be compared are never equal to the default.
+    '''
+    if value is default:
+        return True
+
+    try:
+        equal = value == default
+
+        if not isinstance(equal, bool):
+            if getattr(value, 'shape', ()) != getattr(default, 'shape', ()):
+                return False
+
+            equal = equal.all()
+
+        return bool(equal)
+
+    except Exception:
+        return False
+
+
+class ArgBinder(object):
+    '''
+    Binds the arguments of calls to a function to the names of its parameters.
+    The parameters are inspected once, when the binder is created, so that
+    binding is cheap on every call.
+
+    Parameters that are hidden (their names begin with '_', or are `self`) are
+    left out of the bound arguments. The name-changing arguments are those that
+    are not hidden and are not taking on their default value.
+    '''
+
+    def __init__(self, fn, skip_first=False):
+        '''
+        Parameters
+        ----------
+        fn : function
+            The function whose arguments will be bound.
+        skip_first : bool, optional
+            If True, the first parameter of `fn` is not bound, e.g., because it
+            is the `self` parameter of an unbound method that is passed
+            separately.
+        '''
+        parameters = list(signature(fn).parameters.values())
+
+        if skip_first:
+            parameters = parameters[1:]
+
+        positional = [
+            p for p in parameters
+            if p.kind in (Parameter.POSITIONAL_ONLY,
+                Parameter.POSITIONAL_OR_KEYWORD)
+        ]
+
+        self.fn_name = fn.__name__
+        self.positional_names = tuple(p.name for p in positional)
+        self.positional_hidden = tuple(_is_hidden(p.name) for p in positional)
+        self.num_positional = len(positional)
+
+        self.var_positional = None
+        for p in parameters:
+            if p.kind == Parameter.VAR_POSITIONAL:
+                self.var_positional = p.name
+
+        self.defaults = {
+            p.name: p.default for p in parameters
+            if p.default is not Parameter.empty
+        }
+
+        # Mask of the positional arguments that may affect the name.
+        self.positional_visible = tuple(
+            not hidden for hidden in self.positional_hidden)
+
+        self.var_positional_visible = (
+            self.var_positional is not None and
+            not _is_hidden(self.var_positional))
+
+
+    def bind(self, args, kwargs):
+        '''
+        Returns
+        -------
+        (dict, dict)
+            The name-changing arguments, and all of the arguments that are not
+            hidden, including those taking on their default value.
+        '''
+        name_changing_args = {}
+        all_args = {}
+        defaults = self.defaults
+
+        num_args = len(args)
+
+        if num_args > self.num_positional:
+            if self.var_positional is None:
+                raise TypeError(
+                    '{}() takes {} positional arguments but {} were given'
+                    .format(self.fn_name, self.num_positional, num_args))
+
+            if self.var_positional_visible:
+                extra = tuple(args[self.num_positional:])
+                all_args[self.var_positional] = extra
+                name_changing_args[self.var_positional] = extra
+
+            num_args = self.num_positional
+
+        for i in range(num_args):
+            if self.positional_hidden[i]:
+                continue
+
+            name = self.positional_names[i]
+            arg = args[i]
+
+            all_args[name] = arg
+
+            if name not in defaults or not is_default(arg, defaults[name]):
+                name_changing_args[name] = arg
+
+        for kw, arg in kwargs.items():
+            if _is_hidden(kw):
+                continue
+
+            all_args[kw] = arg
+
+            if kw not in defaults or not is_default(arg, defaults[kw]):
+                name_changing_args[kw] = arg
+
+        return name_changing_args, all_args
+
+
+    def key(self, args, kwargs):
+        '''
+        Returns a hashable key for the arguments that may affect the name, or
+        None if any of them cannot be safely memoized (e.g., because they are
+        mutable, or their type is not known to have a canonical string
+        representation).
+        '''
+        num_args = len(args)
+
+        values = tuple(compress(args, self.positional_visible))
+
+        if num_args > self.num_positional and self.var_positional_visible:
+            values += args[self.num_positional:]
+
+        if kwargs:
+            kws = tuple([kw for kw in kwargs if not _is_hidden(kw)])
+            values += tuple([kwargs[kw] for kw in kws])
+        else:
+            kws = ()
+
+        # The types are part of the key since, e.g., `1 == 1.0 == True`, but
+        # their string representations differ.
+        types = tuple(map(type, values))
+
+        if _MEMO_TYPES.issuperset(types):
+            return num_args, kws, types, values
+
+        try:
+            return num_args, kws, tuple(_memo_key(v) for v in values)
+
+        except TypeError:
+            return None
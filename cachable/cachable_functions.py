@@ -1,10 +1,21 @@
-from inspect import getargspec
+import warnings
 
+from collections import OrderedDict
+from pickle import PicklingError
+from time import perf_counter
+
+from cachable.admission import (
+    CacheStats, DISK, FixedAdmission, MEMORY, get_policy)
+from cachable.arguments import ArgBinder
 from cachable.cached_objects import CachedObject
 from cachable.file_names import Namer
 from cachable.loaders import PickleLoader
 
 
+# Marks results that are not kept in memory, since `None` is a valid result.
+_MISSING = object()
+
+
 class Cachable(object):
     '''
     Decorator for a function that insturments the function to cache its result
@@ -18,14 +29,42 @@ class Cachable(object):
     should not have side-effects, and will be made implicitly deterministic),
     wrapped as a `CachedObject`, which stores the parameters used to create the
     object.
+
+    The file names for calls whose name-changing args are all of simple
+    immutable types (e.g., numbers, strings, and tuples of these) are memoized,
+    so repeated calls skip binding the args and building the file name.
+
+    Whenever the result has to be computed, the compute time and serialized size
+    of the result are measured, and an admission policy decides whether the
+    result is persisted to disk, kept in memory only, or not cached at all. The
+    decisions, along with hit and miss counts, are available on the
+    instrumented function as `stats`. Note that, unlike results loaded from
+    disk, results kept in memory are the same object on every call, so they
+    should not be modified.
+
+    The instrumented function can be called from multiple threads, but calls
+    are not otherwise synchronized, so concurrent misses on the same args may
+    each compute the result.
     '''
 
+    # Admission policy used by functions that do not specify `admission`.
+    default_admission = None
+
+    # Maximum number of argument combinations whose file names are memoized.
+    # The least recently used combinations are evicted first.
+    memo_size = 1024
+
+    # Maximum number of results kept in memory by the admission policy. The
+    # least recently used results are evicted first.
+    memory_entries = 256
+
     def __init__(
             self, 
             name=None, 
             directory=None, 
             loader=None, 
             namer=None,
+            admission=None,
             debug=False):
         '''
         Parameters
@@ -45,6 +84,12 @@ class Cachable(object):
             Object that creates the file names based on the name-changing args.
             If None, a default namer is used, but the namer can be configured if
             desired.
+        admission : AdmissionPolicy | str, optional
+            Policy deciding whether computed results are persisted to disk,
+            kept in memory only, or not cached (see `cachable.admission`). A
+            decision string ('disk', 'memory' or 'none') can be given to always
+            make that decision. If None, `Cachable.default_admission` is used,
+            which by default persists every result to disk.
         debug : bool
             If set to true, prints debugging info. False by default.
         '''
@@ -58,119 +103,213 @@ class Cachable(object):
         if directory is not None:
             self.namer.configure_directory(directory)
 
+        self.admission = get_policy(
+            self.default_admission if admission is None else admission)
+
+        self.stats = CacheStats()
+        self._memory = OrderedDict()
+
         self.debug = debug
 
 
     def __call__(self, fn):
-        if self.name is None:
-            self.name = fn.__name__
+        self.namer.configure_name(
+            fn.__name__ if self.name is None else self.name)
 
-        self.namer.configure_name(self.name)
+        # Inspect the signature once, rather than on every call.
+        binder = ArgBinder(fn)
 
-        # Get the argument names and defaults from the argspec.
-        argspec = getargspec(fn)
-        num_defaults = 0 if argspec.defaults is None else len(argspec.defaults)
-        
-        self.arg_names = argspec.args
-        self.defaults = {
-            argspec.args[-num_defaults + i]: argspec.defaults[i] 
-            for i in range(num_defaults)
-        }
+        # Memo of the name-changing args to the name, file name and args of the
+        # cached object, for calls whose args can be safely memoized.
+        memo = OrderedDict()
 
         def _fn(*args, **kwargs):
             # Allow the user to specify that the cached file should be 
             # refreshed.
-            refresh = False
-            if '_refresh' in kwargs:
-                refresh = kwargs['_refresh']
-                del kwargs['_refresh']
+            refresh = kwargs.pop('_refresh', False)
 
             # Allow the user to specify that the file should be refreshed and 
             # not saved. Essentially this ignores the functionality of this 
             # decorator.
-            refresh_no_save = False
-            if '_refresh_no_save' in kwargs:
-                refresh_no_save = kwargs['_refresh_no_save']
-                del kwargs['_refresh_no_save']
+            refresh_no_save = kwargs.pop('_refresh_no_save', False)
 
             # Get the args that should affect the file name.
-            name_changing_args, all_args = self._get_relevant_args(args, kwargs)
-            
-            # Load or compute the object.
+            key = binder.key(args, kwargs)
+            entry = None if key is None else memo.get(key)
 
-            filename = self.namer.filename_for_args(name_changing_args)
-            name = self.namer.name_for_args(name_changing_args)
+            if entry is None:
+                name_changing_args, all_args = binder.bind(args, kwargs)
 
-            if refresh or refresh_no_save:
-                # Just refresh regardless of if file exists.
-                if self.debug:
-                    print('{} cache : just refreshing'.format(self.name))
+                name = self.namer.name_for_args(name_changing_args)
+                filename = self.namer.filename_for_name(name)
+
+                if key is not None and self.memo_size > 0:
+                    # Evict the least recently used entry.
+                    if len(memo) >= self.memo_size:
+                        try:
+                            memo.popitem(last=False)
 
-                result = fn(*args, **kwargs)
+                        except KeyError:
+                            # Another thread emptied the memo concurrently.
+                            pass
 
-                if not refresh_no_save:
-                    self.loader.save(filename, result)
+                    memo[key] = name, filename, all_args
 
             else:
+                name, filename, all_args = entry
+
+                # Another thread may have evicted the entry since it was read.
                 try:
-                    # Load file.
-                    if self.debug:
-                        print(
-                            '{} cache : attempting to load from {}'
-                            .format(self.name, filename))
+                    memo.move_to_end(key)
 
-                    result = self.loader.load(filename)
+                except KeyError:
+                    pass
+            
+            # Load or compute the object.
 
-                except (OSError, IOError):
-                    # Actually compute the data and save the result.
-                    if self.debug:
-                        print(
-                            '{} cache : creating and saving to {}'
-                            .format(self.name, filename))
+            if refresh or refresh_no_save:
+                # Just refresh regardless of if file exists.
+                if self.debug:
+                    print(
+                        '{} cache : just refreshing'.format(self.namer.name))
 
+                if refresh_no_save:
                     result = fn(*args, **kwargs)
+                else:
+                    result = self._compute_and_admit(
+                        fn, args, kwargs, filename, refresh=True)
+
+            else:
+                result = self._load_from_memory(filename)
 
-                    self.loader.save(filename, result)
+                if result is _MISSING:
+                    result = self._load_or_compute(fn, args, kwargs, filename)
 
-            return CachedObject(result, all_args, name, filename, self.loader)
+            return CachedObject(
+                result, dict(all_args), name, filename, self.loader)
 
         _fn.parent = fn
+        _fn.stats = self.stats
 
         return _fn
 
 
-    def _get_relevant_args(self, args, kwargs):
-        # Add the args if they are not taking on their default value, marked to
-        # be ignored, or `self`.
-        name_changing_args = {
-            self.arg_names[i]: arg 
-            for i, arg in enumerate(args)
-            if not self.arg_names[i].startswith('_') and 
-                not self.arg_names[i] == 'self' and (
-                    self.arg_names[i] not in self.defaults or 
-                    self.defaults[self.arg_names[i]] != arg)
-        }
-
-        # Add the kwargs if they are not taking on their default value or marked
-        # to be ignored.
-        for kw in kwargs:
-            if not kw.startswith('_') and (
-                    kw not in self.defaults or 
-                    self.defaults[kw] != kwargs[kw]):
-
-                name_changing_args[kw] = kwargs[kw]
-
-        # Also get all the args for adding to the `CachedObject`. This includes
-        # all the args that were used to create this object, even if they took
-        # their default values.
-        all_args = {
-            self.arg_names[i]: arg 
-            for i, arg in enumerate(args)
-            if not self.arg_names[i].startswith('_') and
-                not self.arg_names[i] == 'self'
-        }
-
-        for kw in name_changing_args:
-            all_args[kw] = name_changing_args[kw]
-
-        return name_changing_args, all_args
+    def _load_from_memory(self, filename):
+        # The result is looked up only once, since other threads calling the
+        # function may evict it at any point.
+        result = self._memory.get(filename, _MISSING)
+
+        if result is _MISSING:
+            return result
+
+        try:
+            self._memory.move_to_end(filename)
+
+        except KeyError:
+            pass
+
+        if self.debug:
+            print(
+                '{} cache : loading {} from memory'
+                .format(self.namer.name, filename))
+
+        self.stats.memory_hits += 1
+
+        return result
+
+
+    def _load_or_compute(self, fn, args, kwargs, filename):
+        try:
+            # Load file.
+            if self.debug:
+                print(
+                    '{} cache : attempting to load from {}'
+                    .format(self.namer.name, filename))
+
+            result = self.loader.load(filename)
+            self.stats.disk_hits += 1
+
+        except (OSError, IOError):
+            # Actually compute the data and cache the result.
+            if self.debug:
+                print(
+                    '{} cache : creating {}'.format(self.namer.name, filename))
+
+            result = self._compute_and_admit(fn, args, kwargs, filename)
+
+        return result
+
+
+    def _compute_and_admit(self, fn, args, kwargs, filename, refresh=False):
+        start = perf_counter()
+        result = fn(*args, **kwargs)
+        compute_time = perf_counter() - start
+
+        # Serialize once, both to measure the size and to write it if the
+        # result is persisted.
+        data = None
+        error = None
+
+        if self.admission.needs_size:
+            try:
+                data = self.loader.dumps(result)
+
+            except (PicklingError, TypeError, AttributeError) as e:
+                error = e
+
+        size = None if data is None else len(data)
+
+        decision = self.admission.admit(compute_time, size)
+
+        if decision == DISK and error is not None:
+            # Policies that always persist (e.g., the default) require the
+            # result to be serializable.
+            if isinstance(self.admission, FixedAdmission):
+                raise error
+
+            # Other policies decided without knowing the size, so the result
+            # can still be kept in memory.
+            warnings.warn(
+                '{} cache : result cannot be serialized ({}), keeping it in '
+                'memory instead'.format(self.namer.name, error))
+
+            decision = MEMORY
+
+        self.stats.record_miss(decision, compute_time, size)
+
+        if self.debug:
+            print(
+                '{} cache : computed in {:.4f}s ({} bytes), caching in {}'
+                .format(self.namer.name, compute_time, size, decision))
+
+        self._memory.pop(filename, None)
+
+        if decision == DISK:
+            if data is None:
+                self.loader.save(filename, result)
+            else:
+                self.loader.save_bytes(filename, data)
+
+        else:
+            if decision == MEMORY and self.memory_entries > 0:
+                if len(self._memory) >= self.memory_entries:
+                    try:
+                        self._memory.popitem(last=False)
+
+                    except KeyError:
+                        # Another thread emptied the cache concurrently.
+                        pass
+
+                self._memory[filename] = result
+
+            # When refreshing, a previous result may have been persisted. Remove
+            # it so it is not loaded in place of the refreshed result. Loaders
+            # that do not implement `delete` leave the previous result as is.
+            if refresh:
+                try:
+                    self.loader.delete(filename)
+
+                except (OSError, IOError, NotImplementedError):
+                    pass
+
+        return result
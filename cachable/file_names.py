@@ -36,10 +36,14 @@ class Namer(object):
 
 
     def filename_for_args(self, args):
+        return self.filename_for_name(self.name_for_args(args))
+
+
+    def filename_for_name(self, name):
         if self.directory is None:
             raise ValueError('Need to configure `directory`.')
 
-        return '{}/{}'.format(self.directory, self.name_for_args(args))
+        return '{}/{}'.format(self.directory, name)
 
 
     def name_for_args(self, args):
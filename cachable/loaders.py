@@ -1,5 +1,8 @@
+import os
 import pickle
 
+from io import BytesIO
+
 
 class Loader(object):
 
@@ -9,6 +12,24 @@ class Loader(object):
     def save(self, filename, obj):
         raise NotImplementedError()
 
+    def dumps(self, obj):
+        '''
+        Returns the serialized bytes of `obj`, which can later be written with
+        `save_bytes`, or None if this loader cannot serialize to memory.
+        '''
+        return None
+
+    def save_bytes(self, filename, data):
+        raise NotImplementedError()
+
+    def delete(self, filename):
+        '''
+        Removes the object saved to `filename`. Raises an `OSError` if there is
+        no such object. Optional; loaders that do not implement this leave
+        stale results in place when a refreshed result is not persisted.
+        '''
+        raise NotImplementedError()
+
 
 class PickleLoader(Loader):
 
@@ -17,8 +38,17 @@ class PickleLoader(Loader):
             return pickle.load(f)
 
     def save(self, filename, obj):
+        self.save_bytes(filename, self.dumps(obj))
+
+    def dumps(self, obj):
+        return pickle.dumps(obj)
+
+    def save_bytes(self, filename, data):
         with open(filename + '.pkl', 'wb') as f:
-            pickle.dump(obj, f)
+            f.write(data)
+
+    def delete(self, filename):
+        os.remove(filename + '.pkl')
 
 
 try:
@@ -32,6 +62,18 @@ try:
         def save(self, filename, array):
             np.save(filename + '.npy', array)
 
+        def dumps(self, array):
+            buffer = BytesIO()
+            np.save(buffer, array)
+            return buffer.getvalue()
+
+        def save_bytes(self, filename, data):
+            with open(filename + '.npy', 'wb') as f:
+                f.write(data)
+
+        def delete(self, filename):
+            os.remove(filename + '.npy')
+
 except:
     # Only include if numpy is installed.
     pass
@@ -58,6 +100,9 @@ try:
         def save(self, filename, model):
             model.save(filename + '.h5')
 
+        def delete(self, filename):
+            os.remove(filename + '.h5')
+
 except:
     # Only include if keras is installed.
     pass
@@ -80,6 +125,9 @@ try:
         def save(self, filename, model):
             model.save(filename + '.h5')
 
+        def delete(self, filename):
+            os.remove(filename + '.h5')
+
 except:
     # Only include if tensorflow is installed.
     pass
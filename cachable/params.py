@@ -1,6 +1,5 @@
-from inspect import getargspec
-
 from cachable import Cachable
+from cachable.arguments import ArgBinder
 from cachable.file_names import Namer
 
 
@@ -15,27 +14,19 @@ class CachableParam(Cachable):
         self.namer = Namer() if namer is None else namer
         
     def __call__(self, cls):
-        if self.name is None:
-            self.name = cls.__name__
-
-        self.namer.configure_name(self.name)
+        self.namer.configure_name(
+            cls.__name__ if self.name is None else self.name)
 
         this = self
         original_init = cls.__init__
 
-        argspec = getargspec(original_init)
-        num_defaults = 0 if argspec.defaults is None else len(argspec.defaults)
-        
-        self.arg_names = argspec.args[1:]
-        self.defaults = {
-            argspec.args[-num_defaults + i] : argspec.defaults[i] 
-            for i in range(num_defaults)
-        }
+        # The `self` argument is not passed to the binder.
+        binder = ArgBinder(original_init, skip_first=True)
 
         def _init(self, *args, **kwargs):
 
             # Get the args that should affect the name.
-            name_changing_args, all_args = this._get_relevant_args(args, kwargs)
+            name_changing_args, all_args = binder.bind(args, kwargs)
 
             name = this.namer.name_for_args(name_changing_args)
 
@@ -0,0 +1,105 @@
+'''
+Measures the per-call overhead of warm hits on a cheap `Cachable` function,
+i.e., the time taken by a call whose result is already cached, with and without
+memoizing the file names of the args.
+
+Only results kept in memory reach an overhead of a few microseconds; warm hits
+on results persisted to disk are dominated by loading the result from disk.
+
+Run from the repo directory with `PYTHONPATH=. python tests/benchmark.py`.
+'''
+import shutil
+import tempfile
+
+from timeit import repeat
+
+from cachable import Cachable
+from cachable.arguments import ArgBinder
+from cachable.file_names import Namer
+
+
+# Loose upper bound on the overhead of a memoized warm hit on a result kept in
+# memory, in microseconds.
+MAX_MEMORY_HIT_OVERHEAD_US = 10.
+
+
+def best_time_us(fn, number=20000):
+    return min(repeat(fn, number=number, repeat=5)) / number * 1e6
+
+
+def cached(directory, admission=None, memo_size=None):
+    cachable = Cachable('f', directory, admission=admission)
+
+    if memo_size is not None:
+        cachable.memo_size = memo_size
+
+    @cachable
+    def f(a, b, c=3, _msg=None):
+        return [a, b, c]
+
+    # Populate the cache.
+    f(1, 2, c=4)
+
+    return f
+
+
+def main():
+    directory = tempfile.mkdtemp()
+
+    try:
+
+        def g(a, b, c=3, _msg=None):
+            return [a, b, c]
+
+        memory = cached(directory, admission='memory')
+        memory_unmemoized = cached(directory, admission='memory', memo_size=0)
+        disk = cached(directory)
+        disk_unmemoized = cached(directory, memo_size=0)
+
+        baseline = best_time_us(lambda: g(1, 2, c=4))
+
+        memory_hit = best_time_us(lambda: memory(1, 2, c=4))
+        memory_hit_unmemoized = best_time_us(
+            lambda: memory_unmemoized(1, 2, c=4))
+
+        disk_hit = best_time_us(lambda: disk(1, 2, c=4), number=2000)
+        disk_hit_unmemoized = best_time_us(
+            lambda: disk_unmemoized(1, 2, c=4), number=2000)
+
+        # Resolving the file name of the args alone.
+        binder = ArgBinder(g)
+        namer = Namer(directory, 'f')
+        memo = {binder.key((1, 2), dict(c=4)): None}
+
+        def memoized_name():
+            return memo.get(binder.key((1, 2), dict(c=4)))
+
+        def unmemoized_name():
+            name_changing_args, _ = binder.bind((1, 2), dict(c=4))
+            return namer.filename_for_name(
+                namer.name_for_args(name_changing_args))
+
+        name = best_time_us(memoized_name)
+        name_unmemoized = best_time_us(unmemoized_name)
+
+        print('                   memoized  unmemoized')
+        print('file name        : {:6.2f} us  {:6.2f} us'.format(
+            name, name_unmemoized))
+        print('memory warm hit  : {:6.2f} us  {:6.2f} us'.format(
+            memory_hit, memory_hit_unmemoized))
+        print('disk warm hit    : {:6.2f} us  {:6.2f} us'.format(
+            disk_hit, disk_hit_unmemoized))
+        print('uncached call    : {:6.2f} us'.format(baseline))
+
+        assert memory.stats.misses == 1 and disk.stats.misses == 1
+
+        assert name < name_unmemoized
+        assert memory_hit < memory_hit_unmemoized
+        assert memory_hit - baseline < MAX_MEMORY_HIT_OVERHEAD_US
+
+    finally:
+        shutil.rmtree(directory)
+
+
+if __name__ == '__main__':
+    main()
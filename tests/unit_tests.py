@@ -1,9 +1,14 @@
 import os
+import threading
 import unittest
 
 from unittest import TestCase
 
 from cachable import Cachable, CachableParam
+from cachable.admission import CostAwareAdmission
+from cachable.arguments import ArgBinder, is_default
+from cachable.file_names import Namer
+from cachable.loaders import Loader
 
 
 class UnitTest(TestCase):
@@ -256,5 +261,388 @@ class UnitTest(TestCase):
         self.assertEqual(f.counter, 2)
 
 
+    def test_admission_memory(self):
+        counter = [0]
+
+        @Cachable('f', self.dir, admission='memory', debug=True)
+        def f(a):
+            counter[0] += 1
+            return [a]
+
+        res = f(1)
+
+        self.assertEqual(res.obj, [1])
+        self.assertEqual(counter[0], 1)
+
+        # Make sure the file was not created.
+        self.assertFalse(os.path.exists(res._filename + '.pkl'))
+        self.assertEqual(f.stats.last_decision, 'memory')
+
+        res = f(1)
+
+        self.assertEqual(res.obj, [1])
+
+        # Make sure the function body was not run.
+        self.assertEqual(counter[0], 1)
+        self.assertEqual(f.stats.memory_hits, 1)
+        self.assertEqual(f.stats.misses, 1)
+
+
+    def test_admission_memory_eviction(self):
+        counter = [0]
+
+        @Cachable('f', self.dir, admission='memory', debug=True)
+        def f(a):
+            counter[0] += 1
+            return [a]
+
+        self.assertEqual(Cachable.memory_entries, 256)
+
+        for a in range(257):
+            f(a)
+
+        self.assertEqual(counter[0], 257)
+
+        # Make sure the least recently used result was evicted.
+        f(1)
+        self.assertEqual(counter[0], 257)
+
+        f(0)
+        self.assertEqual(counter[0], 258)
+
+
+    def test_admission_memory_threads(self):
+        cachable = Cachable('f', self.dir, admission='memory')
+        cachable.memory_entries = 2
+        cachable.memo_size = 2
+
+        @cachable
+        def f(a):
+            return [a]
+
+        errors = []
+
+        def call():
+            try:
+                for i in range(2000):
+                    self.assertEqual(f(i % 4).obj, [i % 4])
+
+            except Exception as e:
+                errors.append(e)
+
+        threads = [threading.Thread(target=call) for _ in range(4)]
+
+        for thread in threads:
+            thread.start()
+
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(errors, [])
+
+
+    def test_admission_none(self):
+        counter = [0]
+
+        @Cachable('f', self.dir, admission='none', debug=True)
+        def f(a):
+            counter[0] += 1
+            return [a]
+
+        res = f(1)
+        res = f(1)
+
+        self.assertEqual(res.obj, [1])
+
+        # Make sure the function body was run both times.
+        self.assertEqual(counter[0], 2)
+        self.assertFalse(os.path.exists(res._filename + '.pkl'))
+        self.assertEqual(f.stats.decisions['none'], 2)
+
+
+    def test_refresh_removes_stale_file(self):
+        value = [1]
+
+        @Cachable('g', self.dir, debug=True)
+        def g(a):
+            return value[0]
+
+        self.assertEqual(g(1).obj, 1)
+
+        value[0] = 2
+
+        @Cachable('g', self.dir, admission='none', debug=True)
+        def g2(a):
+            return value[0]
+
+        res = g2(1, _refresh=True)
+
+        self.assertEqual(res.obj, 2)
+
+        # Make sure the stale file was removed rather than loaded.
+        self.assertFalse(os.path.exists(res._filename + '.pkl'))
+        self.assertEqual(g2(1).obj, 2)
+
+
+    def test_admission_unpicklable(self):
+        counter = [0]
+
+        @Cachable('f', self.dir, admission='memory', debug=True)
+        def f(a):
+            counter[0] += 1
+            return threading.Lock()
+
+        res = f(1)
+        res = f(1)
+
+        self.assertEqual(counter[0], 1)
+        self.assertIsNone(f.stats.last_size)
+
+        # Results that cannot be persisted by a cost-aware policy fall back to
+        # memory.
+        @Cachable(
+            'g',
+            self.dir,
+            admission=CostAwareAdmission(0., max_bytes_per_second=1e9),
+            debug=True)
+        def g(a):
+            return threading.Lock()
+
+        with self.assertWarns(UserWarning):
+            res = g(1)
+
+        self.assertFalse(os.path.exists(res._filename + '.pkl'))
+        self.assertEqual(g.stats.last_decision, 'memory')
+
+        # The default policy persists everything, so the error is raised.
+        @Cachable('h', self.dir, debug=True)
+        def h(a):
+            return threading.Lock()
+
+        with self.assertRaises(TypeError):
+            h(1)
+
+
+    def test_refresh_with_custom_loader(self):
+
+        class DictLoader(Loader):
+            # Loader that only implements `load` and `save`.
+            def __init__(self):
+                self.saved = {}
+
+            def load(self, filename):
+                if filename not in self.saved:
+                    raise IOError()
+
+                return self.saved[filename]
+
+            def save(self, filename, obj):
+                self.saved[filename] = obj
+
+        @Cachable('c', self.dir, loader=DictLoader(), admission='memory')
+        def c(a):
+            return [a]
+
+        res = c(1, _refresh=True)
+
+        self.assertEqual(res.obj, [1])
+        self.assertEqual(c.stats.last_decision, 'memory')
+
+
+    def test_cost_aware_admission(self):
+        policy = CostAwareAdmission(
+            min_compute_time=0.01,
+            max_bytes_per_second=1000,
+            max_memory_size=100)
+
+        self.assertEqual(policy.admit(1., 10), 'disk')
+        self.assertEqual(policy.admit(1., None), 'disk')
+
+        # Too cheap to compute.
+        self.assertEqual(policy.admit(0.001, 10), 'memory')
+
+        # Too large compared with the compute time.
+        self.assertEqual(policy.admit(0.05, 60), 'memory')
+        self.assertEqual(policy.admit(0.05, 200), 'none')
+
+        # The size is only measured when there are size limits.
+        self.assertTrue(policy.needs_size)
+        self.assertFalse(CostAwareAdmission().needs_size)
+
+        @Cachable('f', self.dir, admission=policy, debug=True)
+        def f(a):
+            return [a]
+
+        res = f(1)
+
+        self.assertFalse(os.path.exists(res._filename + '.pkl'))
+        self.assertEqual(f.stats.last_decision, 'memory')
+
+
+    def test_keyword_only_and_var_kwargs(self):
+        counter = [0]
+
+        @Cachable('f', self.dir, debug=True)
+        def f(a, *, b=2, _msg=None, **kwargs):
+            counter[0] += 1
+            return dict(a=a, b=b, **kwargs)
+
+        res = f(1, b=2, _msg='hello')
+
+        self.assertEqual(res.obj, dict(a=1, b=2))
+        self.assertEqual(counter[0], 1)
+        self.assertEqual(res._name, 'f.a-1')
+
+        res = f(1, _msg='world')
+
+        # Make sure the function body was not run.
+        self.assertEqual(counter[0], 1)
+
+        res = f(1, b=3, c=4)
+
+        self.assertEqual(res.obj, dict(a=1, b=3, c=4))
+        self.assertEqual(counter[0], 2)
+        self.assertEqual(res._name, 'f.a-1.b-3.c-4')
+
+
+    def test_memoized_file_names(self):
+        counter = [0]
+
+        @Cachable('f', self.dir, debug=True)
+        def f(a, b=(1, 2)):
+            counter[0] += 1
+            return [a, b]
+
+        res = f(1)
+        res = f(1)
+
+        self.assertEqual(res.obj, [1, (1, 2)])
+        self.assertEqual(counter[0], 1)
+
+        # Equal arguments of different types have different names.
+        res = f(True)
+
+        self.assertEqual(res._name, 'f.a-True')
+        self.assertEqual(counter[0], 2)
+
+        res = f(1.0, (1, 3))
+
+        self.assertEqual(res._name, 'f.a-1.0.b-1,3')
+        self.assertEqual(counter[0], 3)
+
+        # Equal floats can have different names.
+        res = f(0.0)
+        res = f(-0.0)
+
+        self.assertEqual(res._name, 'f.a--0.0')
+        self.assertEqual(str(res._params['a']), '-0.0')
+        self.assertEqual(str(res.obj[0]), '-0.0')
+
+        res = f(-0.0)
+
+        self.assertEqual(res._name, 'f.a--0.0')
+        self.assertEqual(counter[0], 5)
+
+        # NaNs are only default if they are the default object, so they are
+        # not memoized.
+        nan = float('nan')
+
+        @Cachable('n', self.dir, debug=True)
+        def n(a=nan):
+            return []
+
+        self.assertEqual(n(nan)._name, 'n')
+        self.assertEqual(n(float('nan'))._name, 'n.a-nan')
+        self.assertIsNone(ArgBinder(n).key((nan,), {}))
+
+        # Unhashable arguments are not memoized, but still cached.
+        res = f([4])
+        res = f([4])
+
+        self.assertEqual(res.obj, [[4], (1, 2)])
+        self.assertEqual(counter[0], 6)
+
+
+    def test_memo_eviction(self):
+
+        names = [0]
+
+        class CountingNamer(Namer):
+            def name_for_args(self, args):
+                names[0] += 1
+                return super(CountingNamer, self).name_for_args(args)
+
+        cachable = Cachable('f', namer=CountingNamer(self.dir))
+        cachable.memo_size = 2
+
+        @cachable
+        def f(a):
+            return [a]
+
+        f(1)
+        f(2)
+        f(1)
+        f(3)
+
+        self.assertEqual(names[0], 3)
+
+        # Make sure the least recently used entry, 2, was evicted, not 1.
+        f(1)
+        self.assertEqual(names[0], 3)
+
+        f(2)
+        self.assertEqual(names[0], 4)
+
+
+    def test_arg_binder(self):
+
+        def f(self, a, b=3, *args, c=None, _d=4, **kwargs):
+            pass
+
+        binder = ArgBinder(f)
+
+        name_changing_args, all_args = binder.bind((None, 1, 3), dict(c=2))
+
+        self.assertEqual(name_changing_args, dict(a=1, c=2))
+        self.assertEqual(all_args, dict(a=1, b=3, c=2))
+
+        name_changing_args, all_args = binder.bind(
+            (None, 1, 2, 5, 6), dict(_d=5, e=7))
+
+        self.assertEqual(name_changing_args, dict(a=1, b=2, args=(5, 6), e=7))
+
+        self.assertEqual(
+            binder.key((None, 1), {}), binder.key((object(), 1), {}))
+        self.assertNotEqual(
+            binder.key((None, 1), {}), binder.key((None, 2), {}))
+        self.assertIsNone(binder.key((None, [1]), {}))
+
+        with self.assertRaises(TypeError):
+            ArgBinder(lambda a: None).bind((1, 2), {})
+
+
+    def test_is_default(self):
+
+        class ElementWise(object):
+            # Compares element-wise, like a NumPy array.
+            def __init__(self, values):
+                self.values = values
+                self.shape = (len(values),)
+
+            def __eq__(self, other):
+                return ElementWise(
+                    [v == w for v, w in zip(self.values, other.values)])
+
+            def all(self):
+                return all(self.values)
+
+        self.assertTrue(is_default(3, 3))
+        self.assertFalse(is_default(4, 3))
+        self.assertTrue(is_default(ElementWise([1, 2]), ElementWise([1, 2])))
+        self.assertFalse(is_default(ElementWise([1, 2]), ElementWise([1, 3])))
+        self.assertFalse(is_default(ElementWise([1, 2]), ElementWise([1])))
+        self.assertFalse(is_default(ElementWise([1]), 1))
+
+
 if __name__ == '__main__':
     unittest.main() 